@@ -1,9 +1,26 @@
-import subprocess
+import argparse
+import asyncio
+import errno
+import importlib.util
+import io
+import mmap
 import socket
+import select
+import selectors
+import struct
+import time
 import datetime
 import os
 import platform # New import to detect the operating system
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+
+try:
+    # Optional: python-isal compresses gzip several times faster than the built-in module
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
 
 # ====================================================================
 # Tool Configuration Settings
@@ -12,91 +29,499 @@ from typing import List, Dict, Any
 INPUT_FILE = "targets.txt"
 TARGET_PORTS = [80, 443, 22, 3389, 21] 
 PORT_TIMEOUT = 1  
+PING_TIMEOUT = 1 # Seconds to wait for ICMP Echo Replies
+ICMP_RCVBUF = 1024 * 1024 # Receive buffer (bytes) for the ICMP socket, so replies to large batches are not dropped
+RTT_TIMEOUT_FACTOR = 8 # Once a device's first Port answers, its other Port probes wait at most this many RTTs...
+MIN_PORT_TIMEOUT = 0.05 # ...but never less than this many seconds
+MAX_WORKERS = 64 # Number of devices scanned in parallel
+PING_CONCURRENCY = 256 # Max ping processes running at once when the ping command is used
+MMAP_THRESHOLD = 64 * 1024 # Target files at least this large (bytes) are parsed in bulk via mmap
+REPORT_COMPRESSLEVEL = 1 # gzip level for the report; HTML is repetitive, so the fastest level already shrinks it a lot
 OUTPUT_FILE = f"network_health_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
 
+# The OS cannot change while the tool runs, so the ping command is chosen once here
+if platform.system().lower() == "windows":
+    # Windows command: -n 1 (count 1), -w 1000 (timeout 1000ms)
+    _PING_CMD_PREFIX = ["ping", "-n", "1", "-w", "1000"]
+else:
+    # Linux/macOS command: -c 1 (count 1), -W 1 (timeout 1s)
+    _PING_CMD_PREFIX = ["ping", "-c", "1", "-W", "1"]
+
+# ====================================================================
+# Report Templates (built once, filled in per row)
+# ====================================================================
+
+ROW_TMPL = """
+                <tr>
+                    <td>{target}</td>
+                    <td class="{ping_class}">{ping_status}</td>
+                    <td>{ports_cell}</td>
+                </tr>
+        """
+PORT_TMPL = '<span class="{port_class}">Port {port}: {status_text}</span>'
+
+# Each Port has only two possible cells, so all of them are rendered up front: (port, is_open) -> HTML
+_PORT_CELL = {
+    (port, is_open): PORT_TMPL.format(
+        port_class="port-open" if is_open else "port-closed",
+        port=port,
+        status_text="Open" if is_open else "Closed",
+    )
+    for port in TARGET_PORTS
+    for is_open in (True, False)
+}
+
+_PING_CELL = {True: ("status-ok", "UP (Reachable)"), False: ("status-fail", "DOWN (Unreachable)")}
+
+# ====================================================================
+# Port Results
+# ====================================================================
+
+# Port status is encoded as a bitmask per device: bit i is set if TARGET_PORTS[i] is open
+_PORT_BIT = {port: 1 << i for i, port in enumerate(TARGET_PORTS)}
+
+
+def _port_mask(ports_status: Dict[int, bool]) -> int:
+    """Encodes a device's Port results ({port: is_open}) as a bitmask."""
+    mask = 0
+    for port, is_open in ports_status.items():
+        if is_open:
+            mask |= _PORT_BIT[port]
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _ports_cell(mask: int) -> str:
+    """Renders the Ports cell for a Port bitmask; there are only 2^len(TARGET_PORTS) distinct cells."""
+    return "<br>".join(_PORT_CELL[(port, bool(mask & bit))] for port, bit in _PORT_BIT.items())
+
+
+# Everything in a row after the device name depends only on (ping_ok, port_mask), so it is rendered once per pair
+_ROW_HEAD, _ROW_TAIL_TMPL = ROW_TMPL.split("{target}")
+
+
+@lru_cache(maxsize=None)
+def _row_tail(ping_ok: bool, mask: int) -> str:
+    """Renders the part of a report row that follows the device name."""
+    ping_class, ping_status = _PING_CELL[bool(ping_ok)]
+    return _ROW_TAIL_TMPL.format(ping_class=ping_class, ping_status=ping_status, ports_cell=_ports_cell(mask))
+
 # ====================================================================
 # Core Functions
 # ====================================================================
 
+def _read_lines_mmap(filename: str) -> io.StringIO:
+    """Decodes a large target file from a memory-mapped buffer in one pass instead of reading line by line."""
+    with open(filename, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # newline=None splits lines exactly like a text-mode file, so both read paths see the same lines
+            return io.StringIO(mm[:].decode('utf-8'), newline=None)
+
+
+def _iter_targets(filename: str) -> Iterator[str]:
+    """Yields the targets of a UTF-8 text file in order: stripped lines, without empty lines and comments."""
+    if os.path.getsize(filename) >= MMAP_THRESHOLD:
+        lines = _read_lines_mmap(filename)
+    else:
+        lines = open(filename, 'r', encoding='utf-8')
+    with lines:
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
 def read_targets(filename: str) -> List[str]:
-    """Reads the list of targets (IP/Hostname) from a text file."""
+    """Reads the list of targets (IP/Hostname) from a text file, skipping duplicates."""
     print(f"✅ Reading targets from: {filename}")
     try:
-        with open(filename, 'r') as f:
-            targets = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
-        return targets
+        # dict.fromkeys drops duplicate devices while keeping the file order
+        return list(dict.fromkeys(_iter_targets(filename)))
     except FileNotFoundError:
         print(f"❌ Error: Input file {filename} not found.")
         return []
 
-def ping_check(target: str) -> bool:
-    """Performs a Ping connectivity test for a specific device, adjusting for OS."""
-    
-    # 1. Determine the correct ping command based on the OS
-    current_os = platform.system().lower()
-    
-    if current_os == "windows":
-        # Windows command: -n 1 (count 1), -w 1000 (timeout 1000ms)
-        ping_command = ["ping", "-n", "1", "-w", "1000", target]
-    else:
-        # Linux/macOS command: -c 1 (count 1), -W 1 (timeout 1s)
-        ping_command = ["ping", "-c", "1", "-W", "1", target]
-    
-    # 2. Execute the command
+# Unbounded: one run resolves a bounded target list, and every entry is needed again in the Port phase
+@lru_cache(maxsize=None)
+def resolve(host: str) -> Optional[str]:
+    """Resolves a Hostname to an IPv4 address once; later lookups for the same device come from the cache."""
     try:
-        # The returncode is what matters (0 = success)
-        result = subprocess.run(
-            ping_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=2  # General command timeout
-        )
-        return result.returncode == 0
-    except subprocess.TimeoutExpired:
+        return socket.gethostbyname(host)
+    except socket.gaierror:
+        return None
+
+
+async def ping_one(target: str, semaphore: asyncio.Semaphore) -> bool:
+    """Runs the ping command for a specific device without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    ip = await loop.run_in_executor(None, resolve, target)
+    if ip is None:
         return False
+
+    async with semaphore:
+        # The OS-specific flags were picked once at import (see _PING_CMD_PREFIX); only the returncode matters
+        # (0 = success), so the output goes to DEVNULL instead of a pipe
+        process = await asyncio.create_subprocess_exec(
+            *_PING_CMD_PREFIX, ip,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            return await asyncio.wait_for(process.wait(), 2) == 0  # General command timeout
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False
+
+
+async def ping_all(targets: List[str]) -> Dict[str, bool]:
+    """Pings all devices concurrently with the ping command, capped at PING_CONCURRENCY processes."""
+    semaphore = asyncio.Semaphore(PING_CONCURRENCY)
+    try:
+        results = await asyncio.gather(*[ping_one(target, semaphore) for target in targets])
     except FileNotFoundError:
         print("Warning: Ping command not found. Skipping Ping check.")
-        return False
+        return {target: False for target in targets}
+    return dict(zip(targets, results))
 
 
-def port_check(target: str, port: int, timeout: int) -> bool:
-    """Checks if a specific Port is open using the socket library."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(timeout)
+def _icmp_checksum(data: bytes) -> int:
+    """Computes the Internet checksum (RFC 1071) of an ICMP packet."""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _build_echo_request(identifier: int, sequence: int) -> bytes:
+    """Builds an ICMP Echo Request (type 8, code 0) packet."""
+    payload = b'network-health-checker'
+    header = struct.pack("!BBHHH", 8, 0, 0, identifier, sequence)
+    checksum = _icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", 8, 0, checksum, identifier, sequence) + payload
+
+
+def _open_icmp_socket() -> socket.socket:
+    """Opens a raw ICMP socket, or an unprivileged ICMP datagram socket where the OS allows it."""
     try:
-        result = sock.connect_ex((target, port))
-        # result 0 means connection was successful (Open)
-        return result == 0
-    except socket.gaierror:
-        return False
-    except socket.error:
-        return False
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    except PermissionError:
+        # Linux (net.ipv4.ping_group_range) and macOS allow ICMP Echo over SOCK_DGRAM without root
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+
+
+def _read_echo_reply(sock: socket.socket, identifier: int) -> Optional[Tuple[str, int]]:
+    """Reads one packet from an ICMP socket and returns (source IP, sequence) if it is one of our Echo Replies.
+
+    Raises BlockingIOError if no packet is waiting.
+    """
+    try:
+        packet, (address, _) = sock.recvfrom(1024)
+    except BlockingIOError:
+        raise
+    except OSError:
+        return None
+    if packet and packet[0] >> 4 == 4:
+        # Raw sockets deliver the IP header as well; skip it
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < 8:
+        return None
+    icmp_type, _, _, reply_id, sequence = struct.unpack("!BBHHH", packet[:8])
+    # Datagram sockets rewrite the identifier, so only raw sockets can check it
+    if icmp_type != 0 or (sock.type == socket.SOCK_RAW and reply_id != identifier):
+        return None
+    return address, sequence
+
+
+def _group_by_ip(targets: List[str]) -> Dict[str, List[str]]:
+    """Resolves all devices in parallel and groups them by IP; devices that do not resolve are left out."""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        ips = list(executor.map(resolve, targets))
+    devices_by_ip = {}
+    for target, ip in zip(targets, ips):
+        if ip is not None:
+            devices_by_ip.setdefault(ip, []).append(target)
+    return devices_by_ip
+
+
+def ping_batch(targets: List[str], timeout: float = PING_TIMEOUT) -> Dict[str, bool]:
+    """Pings all devices at once by sending ICMP Echo Requests directly and waiting for the replies together.
+
+    Falls back to running the ping command for all devices concurrently if the OS does not allow ICMP sockets.
+    """
+    results = {target: False for target in targets}
+    try:
+        sock = _open_icmp_socket()
+    except OSError:
+        return asyncio.run(ping_all(targets))
+
+    # 1. Resolve all devices in parallel; one Echo Request per IP covers every name that resolves to it
+    devices_by_ip = _group_by_ip(targets) # Unresolvable devices stay DOWN
+
+    identifier = os.getpid() & 0xFFFF
+    pending = set() # (IP, sequence number) of Echo Requests without a reply yet
+    answered = set() # IPs that replied
+
+    def drain():
+        """Reads every reply that has already arrived, so the receive buffer cannot overflow and drop replies."""
+        while True:
+            try:
+                reply = _read_echo_reply(sock, identifier)
+            except BlockingIOError:
+                return
+            if reply in pending:
+                pending.discard(reply)
+                answered.add(reply[0])
+
+    try:
+        sock.setblocking(False)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, ICMP_RCVBUF)
+        except OSError:
+            pass
+
+        # 2. Send one Echo Request per IP without waiting for the replies, reading the ones already in
+        deadline = time.monotonic() + timeout
+        for sequence, ip in enumerate(devices_by_ip):
+            # Replies are matched on (IP, sequence), so the 16-bit sequence number may wrap on huge lists
+            request = (ip, sequence & 0xFFFF)
+            packet = _build_echo_request(identifier, request[1])
+            while True:
+                try:
+                    sock.sendto(packet, (ip, 0))
+                except BlockingIOError:
+                    # Send buffer full: collect replies and wait until there is room again
+                    drain()
+                    if select.select([], [sock], [], max(deadline - time.monotonic(), 0))[1]:
+                        continue
+                except OSError:
+                    pass # Unreachable devices stay DOWN
+                else:
+                    pending.add(request)
+                break
+            drain()
+            deadline = time.monotonic() + timeout
+
+        # 3. Collect the remaining replies until every device answered or the timeout expires
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+            drain()
     finally:
         sock.close()
 
+    for ip in answered:
+        for target in devices_by_ip[ip]:
+            results[target] = True
+    return results
 
-def generate_html_report(results: List[Dict[str, Any]], filename: str):
-    """Generates an HTML report file."""
-    print(f"📝 Generating HTML report to: {filename}")
-    
-    css_style = """
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f4f4f9; }
-        h1 { color: #333; border-bottom: 2px solid #ccc; padding-bottom: 10px; }
-        .info { background-color: #e9e9ff; padding: 10px; border-radius: 5px; margin-bottom: 20px; }
-        table { width: 100%; border-collapse: collapse; margin-top: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); background-color: white; }
-        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
-        th { background-color: #007bff; color: white; }
-        tr:nth-child(even) { background-color: #f2f2f2; }
-        .status-ok { background-color: #d4edda; color: #155724; font-weight: bold; }
-        .status-fail { background-color: #f8d7da; color: #721c24; font-weight: bold; }
-        .port-open { color: green; font-weight: bold; }
-        .port-closed { color: red; }
-    </style>
+
+# SO_LINGER on, 0 seconds: close() resets the connection instead of leaving it in TIME_WAIT
+_LINGER_RESET = struct.pack('ii', 1, 0)
+
+
+def _new_probe_socket() -> socket.socket:
+    """Creates a TCP socket for a Port probe that frees its local port as soon as it is closed."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # A probe only needs to know whether the connection succeeded; skipping the FIN handshake and TIME_WAIT
+    # keeps large scans from using up the ephemeral port range
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+    return sock
+
+
+def _adaptive_timeout(rtt: float, timeout: float) -> float:
+    """Caps a Port probe timeout based on the device's measured round-trip time."""
+    return min(timeout, max(RTT_TIMEOUT_FACTOR * rtt, MIN_PORT_TIMEOUT))
+
+
+def port_check_batch(target: str, ports: List[int], timeout: float) -> Dict[int, bool]:
+    """Checks several Ports of a device at once using non-blocking sockets and one readiness wait.
+
+    The wait uses the best mechanism the OS offers (epoll on Linux, kqueue on macOS/BSD, select elsewhere),
+    which also avoids select()'s limit of 1024 file descriptors when many devices are scanned in parallel.
+
+    The first successful connection measures the device's TCP round-trip time and caps the wait for the
+    remaining Ports at a few RTTs, so a fast LAN device does not wait the full timeout for its closed Ports.
+    """
+    results = {port: False for port in ports}
+    ip = resolve(target)
+    if ip is None:
+        return results
+
+    selector = selectors.DefaultSelector()
+    pending = set() # sockets whose connection is still in progress
+    rtt = None
+    start = time.monotonic()
+    try:
+        # 1. Start every connection without waiting for it to finish
+        for port in ports:
+            sock = _new_probe_socket()
+            sock.setblocking(False)
+            err = sock.connect_ex((ip, port))
+            if err == 0:
+                results[port] = True
+                sock.close()
+            elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+                selector.register(sock, selectors.EVENT_WRITE, port)
+                pending.add(sock)
+            else:
+                sock.close()
+
+        # 2. Wait for the connections together; each one becomes writable once it succeeds or fails
+        deadline = start + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready = selector.select(remaining)
+            if not ready:
+                break
+            for key, _ in ready:
+                sock = key.fileobj
+                # SO_ERROR 0 means the connection was successful (Open)
+                is_open = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                results[key.data] = is_open
+                if is_open and rtt is None:
+                    rtt = time.monotonic() - start
+                    deadline = min(deadline, start + _adaptive_timeout(rtt, timeout))
+                selector.unregister(sock)
+                pending.discard(sock)
+                sock.close()
+    finally:
+        selector.close()
+        for sock in pending:
+            sock.close()
+    return results
+
+
+def port_check_syn(targets: List[str], ports: List[int], timeout: float) -> Optional[Dict[str, Dict[int, bool]]]:
+    """Checks several Ports of all devices with one half-open SYN scan (requires scapy and root/CAP_NET_RAW).
+
+    One SYN is sent per IP and Port in a single batch and all replies are collected together: SYN-ACK
+    means Open, RST or no reply means Closed. No full TCP handshake is made. Returns the Port status per
+    device, or None if a SYN scan is not possible here.
+    """
+    try:
+        from scapy.all import IP, TCP, sr
+    except ImportError:
+        return None
+
+    results = {target: {port: False for port in ports} for target in targets}
+    devices_by_ip = _group_by_ip(targets) # Unresolvable devices keep all Ports Closed
+    if not devices_by_ip:
+        return results
+
+    try:
+        answered, _ = sr(IP(dst=list(devices_by_ip)) / TCP(dport=ports, flags="S"), timeout=timeout, verbose=0)
+    except (PermissionError, OSError):
+        return None
+    for _, received in answered:
+        # 0x12 = SYN + ACK; the reply comes from the probed IP and Port
+        if received.haslayer(TCP) and int(received[TCP].flags) & 0x12 == 0x12:
+            for target in devices_by_ip.get(received[IP].src, ()):
+                results[target][received[TCP].sport] = True
+    return results
+
+
+def syn_scan_permitted() -> bool:
+    """Checks once, before scanning, whether scapy may open the raw socket a SYN scan needs."""
+    try:
+        from scapy.all import conf
+        conf.L3socket().close()
+    except (ImportError, PermissionError, OSError):
+        return False
+    return True
+
+
+def scan_target(target: str, is_up_by_ping: bool, ports_status: Optional[Dict[int, bool]] = None) -> Dict[str, Any]:
+    """Runs the Port checks for a single device and returns its result entry.
+
+    ports_status is the device's result from port_check_syn(), if a SYN scan was run; otherwise the
+    Ports are checked here with a connect scan.
     """
+    result_entry = {'target': target, 'ping_success': False, 'ports': {}, 'log': []}
+    log = result_entry['log']
+    
+    # A. Initial Ping Check result, from ping_batch() (Can fail due to ICMP blocking)
+    # result_entry['ping_success'] initially takes the Ping result
+    result_entry['ping_success'] = is_up_by_ping
     
-    html_content = f"""
+    # B. Port Scan
+    # All Ports are probed at the same time, so a closed host costs one timeout instead of one per Port
+    if ports_status is None:
+        ports_status = port_check_batch(target, TARGET_PORTS, PORT_TIMEOUT)
+    found_open_port = any(ports_status.values()) # Flag to track if any port is open
+
+    result_entry['ports'] = ports_status
+
+    # C. LOGIC FIX: Re-evaluate the overall status based on Port Scan
+    # If the port scan is successful, the device MUST be reachable, regardless of the Ping result.
+    if found_open_port:
+        if not result_entry['ping_success']:
+            # Override DOWN status only if the Ping was DOWN but an open port was found
+            log.append("   - Ping failed, but an open port was found. Overriding status.")
+        
+        result_entry['ping_success'] = True # Set the final status to UP
+
+    # D. Console Output (printed by main() once the scan completes)
+    final_status = 'UP' if result_entry['ping_success'] else 'DOWN'
+    log.append(f"   - Connectivity Status (Ping check result): {'UP' if is_up_by_ping else 'DOWN'}")
+    log.append(f"   - Final Overall Status (for report): {final_status}")
+
+    return result_entry
+
+
+class HtmlReportWriter:
+    """Writes the HTML report while the scan runs, one row per device as soon as its result is known.
+
+    Used as a context manager: entering writes the header, write_row() appends a device, and leaving
+    writes the footer. Nothing is buffered in memory, and a plain .html report can be refreshed in the
+    browser mid-scan. The report is gzip-compressed as filename + '.gz' unless compress is False.
+    """
+
+    def __init__(self, filename: str, device_count: int, compress: bool = True):
+        self.filename = filename + '.gz' if compress else filename
+        self.device_count = device_count
+        self.rows_written = 0
+        self.compress = compress
+        self._raw = None
+        self._file = None
+
+    def __enter__(self) -> 'HtmlReportWriter':
+        print(f"📝 Writing HTML report to: {self.filename}")
+        if self.compress:
+            # The binary handle is kept so it can be fsynced once gzip has written its trailer
+            self._raw = open(self.filename, 'wb')
+            self._file = gzip.open(self._raw, 'wt', encoding='utf-8', compresslevel=REPORT_COMPRESSLEVEL)
+        else:
+            self._file = open(self.filename, 'w', encoding='utf-8')
+        self._file.write(self._header())
+        return self
+
+    def _header(self) -> str:
+        css_style = """
+        <style>
+            body { font-family: Arial, sans-serif; margin: 20px; background-color: #f4f4f9; }
+            h1 { color: #333; border-bottom: 2px solid #ccc; padding-bottom: 10px; }
+            .info { background-color: #e9e9ff; padding: 10px; border-radius: 5px; margin-bottom: 20px; }
+            table { width: 100%; border-collapse: collapse; margin-top: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); background-color: white; }
+            th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+            th { background-color: #007bff; color: white; }
+            tr:nth-child(even) { background-color: #f2f2f2; }
+            .status-ok { background-color: #d4edda; color: #155724; font-weight: bold; }
+            .status-fail { background-color: #f8d7da; color: #721c24; font-weight: bold; }
+            .port-open { color: green; font-weight: bold; }
+            .port-closed { color: red; }
+        </style>
+        """
+
+        return f"""
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -109,7 +534,7 @@ def generate_html_report(results: List[Dict[str, Any]], filename: str):
         <h1>Network Health Checker Report</h1>
         <div class="info">
             <p><strong>Date and Time Generated:</strong> {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p><strong>Number of Devices Scanned:</strong> {len(results)}</p>
+            <p><strong>Number of Devices in Target List:</strong> {self.device_count}</p>
         </div>
         
         <table>
@@ -122,98 +547,130 @@ def generate_html_report(results: List[Dict[str, Any]], filename: str):
             </thead>
             <tbody>
     """
-    
-    for result in results:
-        # Status determined by the logic in main()
-        is_up = result['ping_success'] 
-        ping_status = "UP (Reachable)" if is_up else "DOWN (Unreachable)"
-        ping_class = "status-ok" if is_up else "status-fail"
-        
-        ports_html = []
-        for port, is_open in result['ports'].items():
-            port_class = "port-open" if is_open else "port-closed"
-            status_text = "Open" if is_open else "Closed"
-            ports_html.append(f'<span class="{port_class}">Port {port}: {status_text}</span>')
 
-        ports_cell = "<br>".join(ports_html)
-        
-        html_content += f"""
-                <tr>
-                    <td>{result['target']}</td>
-                    <td class="{ping_class}">{ping_status}</td>
-                    <td>{ports_cell}</td>
-                </tr>
-        """
+    def write_row(self, result_entry: Dict[str, Any]):
+        """Appends the row of one device (a result entry as returned by scan_target)."""
+        # Status determined by the logic in main(); each row is one concatenation with a cached tail
+        ping_ok = result_entry['ping_success']
+        mask = _port_mask(result_entry['ports'])
+        self._file.write(_ROW_HEAD + result_entry['target'] + _row_tail(ping_ok, mask))
+        self.rows_written += 1
+        if not self.compress:
+            # Make the row visible to a browser refreshing the report; gzip output is only readable once complete
+            self._file.flush()
 
-    html_content += """
+    def __exit__(self, exc_type, exc_value, traceback):
+        # The footer is written even if the scan was interrupted, so a partial report is still valid HTML
+        # and states how many devices it actually covers
+        out = self._raw if self.compress else self._file
+        try:
+            self._file.write(f"""
             </tbody>
         </table>
+        <div class="info">
+            <p><strong>Number of Devices Scanned:</strong> {self.rows_written}</p>
+        </div>
     </body>
     </html>
-    """
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-        
-    print(f"✅ Successfully finished generating the report.")
+    """)
+            if self.compress:
+                self._file.close()
+            out.flush()
+            os.fsync(out.fileno())
+        finally:
+            out.close()
+        if exc_type is None:
+            print(f"✅ Successfully finished generating the report.")
+
+
+def parse_cpu_list(spec: str) -> Set[int]:
+    """Parses a CPU list such as "0-3,8" into a set of CPU numbers (argparse type for --cpu-affinity)."""
+    cpus = set()
+    for part in spec.split(','):
+        first, dash, last = part.partition('-')
+        try:
+            # A range needs both ends ("0-" is rejected); a single CPU has no dash
+            first, last = int(first), int(last if dash else first)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid CPU list: {spec!r} (expected e.g. 0-3,8)")
+        if first < 0 or last < first:
+            raise argparse.ArgumentTypeError(f"invalid CPU range {part!r} in {spec!r}")
+        cpus.update(range(first, last + 1))
+    return cpus
 
 
 def main():
     """Main function to run the tool."""
+    parser = argparse.ArgumentParser(description="Checks Ping and TCP Port status for a list of devices.")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="write the report as plain .html instead of gzip-compressed .html.gz")
+    parser.add_argument('--syn-scan', action='store_true',
+                        help="check Ports with a half-open SYN scan (needs scapy and root/CAP_NET_RAW)")
+    parser.add_argument('--cpu-affinity', type=parse_cpu_list, metavar='CPUS',
+                        help="run the scan only on these CPUs, e.g. 0-3 (Linux only); "
+                             "pick the cores that handle the network card's interrupts")
+    args = parser.parse_args()
+
+    if args.cpu_affinity:
+        if hasattr(os, 'sched_setaffinity'):
+            # Set before any worker thread starts; threads inherit the affinity of the thread that creates them
+            try:
+                os.sched_setaffinity(0, args.cpu_affinity)
+            except OSError as e:
+                print(f"Warning: Could not set CPU affinity ({e}). Using all CPUs.")
+        else:
+            print("Warning: --cpu-affinity is only supported on Linux. Ignoring it.")
+
+    if args.syn_scan and importlib.util.find_spec('scapy') is None:
+        print("Warning: scapy is not installed. Using a regular connect scan instead of a SYN scan.")
+        args.syn_scan = False
+    elif args.syn_scan and not syn_scan_permitted():
+        print("Warning: A SYN scan needs root/CAP_NET_RAW. Using a regular connect scan instead of a SYN scan.")
+        args.syn_scan = False
+
     # 1. Read the list of targets
     targets = read_targets(INPUT_FILE)
     if not targets:
         print("⚠️ No targets found to scan. Please check your targets.txt file.")
         return
 
-    all_results = []
-    
     print(f"\n🔄 Starting scan of {len(targets)} devices...\n")
     
-    # 2. Iterate through each device and perform checks
-    for i, target in enumerate(targets):
-        print(f"[{i+1}/{len(targets)}] Scanning device: {target}...")
-        
-        result_entry = {'target': target, 'ping_success': False, 'ports': {}}
-        
-        # A. Initial Ping Check (Can fail due to ICMP blocking)
-        is_up_by_ping = ping_check(target)
-        # result_entry['ping_success'] initially takes the Ping result
-        result_entry['ping_success'] = is_up_by_ping
-        
-        # B. Port Scan
-        ports_status = {}
-        found_open_port = False # Flag to track if any port is open
-
-        for port in TARGET_PORTS:
-            is_open = port_check(target, port, PORT_TIMEOUT)
-            ports_status[port] = is_open
-            
-            if is_open:
-                found_open_port = True # Set flag if an open port is found
-
-        result_entry['ports'] = ports_status
-
-        # C. LOGIC FIX: Re-evaluate the overall status based on Port Scan
-        # If the port scan is successful, the device MUST be reachable, regardless of the Ping result.
-        if found_open_port:
-            if not result_entry['ping_success']:
-                # Override DOWN status only if the Ping was DOWN but an open port was found
-                print("   - Ping failed, but an open port was found. Overriding status.")
-            
-            result_entry['ping_success'] = True # Set the final status to UP
-
-        # D. Console Output
-        final_status = 'UP' if result_entry['ping_success'] else 'DOWN'
-        print(f"   - Connectivity Status (Ping check result): {'UP' if is_up_by_ping else 'DOWN'}")
-        print(f"   - Final Overall Status (for report): {final_status}")
-
-        all_results.append(result_entry)
-        print("-" * 30)
-
-    # 3. Generate the Report
-    generate_html_report(all_results, OUTPUT_FILE)
-    print(f"\n🎉 Network scan complete! Please open the file {os.path.abspath(OUTPUT_FILE)} to view the results.")
+    # 2. Ping all devices in one batch, and SYN scan their Ports in another if asked to
+    ping_results = ping_batch(targets)
+    syn_results = port_check_syn(targets, TARGET_PORTS, PORT_TIMEOUT) if args.syn_scan else None
+    if args.syn_scan and syn_results is None:
+        print("Warning: The SYN scan failed. Using a regular connect scan instead.")
+
+    # 3. Scan all devices concurrently (the work is network I/O bound, so threads overlap the waits)
+    #    and write each device to the report as soon as its scan completes
+    report = HtmlReportWriter(OUTPUT_FILE, len(targets), compress=not args.no_compress)
+    with report, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(scan_target, target, ping_results[target],
+                                   syn_results[target] if syn_results is not None else None): target
+                   for target in targets}
+        try:
+            for i, future in enumerate(as_completed(futures)):
+                result_entry = future.result()
+                # Log lines are collected per target and flushed here so output from parallel scans doesn't interleave
+                print(f"[{i+1}/{len(targets)}] Scanned device: {result_entry['target']}")
+                for line in result_entry.pop('log'):
+                    print(line)
+                print("-" * 30)
+                report.write_row(result_entry)
+        except BaseException:
+            # On Ctrl-C or an error, drop the queued devices so the executor only waits for the scans
+            # already running, and the report footer is written right after
+            for future in futures:
+                future.cancel()
+            raise
+
+    report_path = os.path.abspath(report.filename)
+    if report.compress:
+        print(f"\n🎉 Network scan complete! The report is gzip-compressed: {report_path}")
+        print(f"   Decompress it to view the results (e.g. gunzip {report_path}), or run with --no-compress for a plain .html file.")
+    else:
+        print(f"\n🎉 Network scan complete! Please open the file {report_path} to view the results.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file